@@ -1,8 +1,9 @@
 import pandas as pd
 import ast
 from functools import reduce
-from itertools import combinations
-from collections import Counter
+from itemsets import encode_masks, mask_counts, mine_itemsets, pair_counts, firm_mask_counts, MIN_SUPPORT, MIN_LIFT
+from profiling import RunProfiler
+from rating_stats import summarise_ratings
 
 #Define categories
 empat_categories = [
@@ -10,26 +11,30 @@ empat_categories = [
 ]
 display_categories = empat_categories[:-1]  #For prediction output
 
+profiler = RunProfiler('analysis')  #Opt-in: set PIPELINE_PROFILE=1 to write a run manifest
+
 # ===== OVERVIEW PANEL =====
 #Bar Chart for Average overall_rating, recommendation %, and outlook % by Firm
-df_reviews = pd.read_csv("./source/CSV/df_reviews.csv")
+df_reviews = profiler.read_csv("./source/CSV/df_reviews.csv")
 
 def percent_positive(col):
     return col.apply(lambda x: 1 if str(x).lower() in ['positive', 'yes'] else 0)
 
-df_reviews['recommend_bin'] = percent_positive(df_reviews['recommend'])
-df_reviews['outlook_bin'] = percent_positive(df_reviews['outlook'])
-
-df_firm_summary = df_reviews.groupby('firm').agg({
-    'overall_rating': lambda x: round(x.mean(), 2),
-    'recommend_bin': lambda x: round(x.mean() * 100, 2),
-    'outlook_bin': lambda x: round(x.mean() * 100, 2)
-}).reset_index().rename(columns={
-    'recommend_bin': 'recommend_percent',
-    'outlook_bin': 'outlook_percent'
-})
+with profiler.stage('overview_summary') as stage:
+    df_reviews['recommend_bin'] = percent_positive(df_reviews['recommend'])
+    df_reviews['outlook_bin'] = percent_positive(df_reviews['outlook'])
+
+    df_firm_summary = df_reviews.groupby('firm').agg({
+        'overall_rating': lambda x: round(x.mean(), 2),
+        'recommend_bin': lambda x: round(x.mean() * 100, 2),
+        'outlook_bin': lambda x: round(x.mean() * 100, 2)
+    }).reset_index().rename(columns={
+        'recommend_bin': 'recommend_percent',
+        'outlook_bin': 'outlook_percent'
+    })
+    stage.rows = len(df_reviews)
 
-df_firm_summary.to_csv('./source/CSV/firm-averages.csv', index=False) # --> Bar chart
+profiler.to_csv(df_firm_summary, './source/CSV/firm-averages.csv', index=False) # --> Bar chart
 
 #Radar Chart for average empat categories per firm
 #Flatten and average category scores for each firm
@@ -42,35 +47,51 @@ def extract_prob_vector(category_dict):
     return vector
 
 #Convert stringified dicts to real dicts
-df_reviews['pros_cat'] = df_reviews['pros_cat'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-df_reviews['cons_cat'] = df_reviews['cons_cat'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+with profiler.stage('literal_eval') as stage:
+    df_reviews['pros_cat'] = df_reviews['pros_cat'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    df_reviews['cons_cat'] = df_reviews['cons_cat'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    stage.rows = len(df_reviews)
 #Add binary columns to df for pros and cons
-for cat in display_categories:
-    df_reviews[f'pros_{cat}'] = df_reviews['pros_cat'].apply(lambda x: extract_prob_vector(x).get(cat, 0))
-    df_reviews[f'cons_{cat}'] = df_reviews['cons_cat'].apply(lambda x: extract_prob_vector(x).get(cat, 0))
+with profiler.stage('expand_categories') as stage:
+    for cat in display_categories:
+        df_reviews[f'pros_{cat}'] = df_reviews['pros_cat'].apply(lambda x: extract_prob_vector(x).get(cat, 0))
+        df_reviews[f'cons_{cat}'] = df_reviews['cons_cat'].apply(lambda x: extract_prob_vector(x).get(cat, 0))
+    stage.rows = len(df_reviews)
 
 #Average by firm
-firm_empat_profile = df_reviews.groupby('firm')[
-    [f'pros_{cat}' for cat in display_categories] + [f'cons_{cat}' for cat in display_categories]
-].mean().multiply(100).round(2).reset_index()
+with profiler.stage('empat_profile') as stage:
+    firm_empat_profile = df_reviews.groupby('firm')[
+        [f'pros_{cat}' for cat in display_categories] + [f'cons_{cat}' for cat in display_categories]
+    ].mean().multiply(100).round(2).reset_index()
+    stage.rows = len(df_reviews)
 
-firm_empat_profile.to_csv('./source/CSV/firm_empat_profile.csv', index=False)# --> Radar-chart
+profiler.to_csv(firm_empat_profile, './source/CSV/firm_empat_profile.csv', index=False)# --> Radar-chart
 
 # ===== TEMPORAL TRENDS PANEL =====
 #Tracking Rated categories over time
-df_reviews['year_month'] = pd.to_datetime(df_reviews['year_month'], errors='coerce')
-df_reviews['year'] = df_reviews['year_month'].dt.year
-rating_cols = ['overall_rating', 'work_life_balance', 'culture_values', 'career_opp', 'comp_benefits', 'senior_mgmt']
+with profiler.stage('yearly_ratings') as stage:
+    df_reviews['year_month'] = pd.to_datetime(df_reviews['year_month'], errors='coerce')
+    df_reviews['year'] = df_reviews['year_month'].dt.year
+    rating_cols = ['overall_rating', 'work_life_balance', 'culture_values', 'career_opp', 'comp_benefits', 'senior_mgmt']
+
+    yearly_ratings = (
+        df_reviews
+        .groupby(['firm', 'year'])[rating_cols]
+        .mean()
+        .reset_index()
+    )
 
-yearly_ratings = (
-    df_reviews
-    .groupby(['firm', 'year'])[rating_cols]
-    .mean()
-    .reset_index()
-)
+    yearly_ratings = yearly_ratings.round(1)
+    stage.rows = len(df_reviews)
 
-yearly_ratings = yearly_ratings.round(1)
-yearly_ratings.to_csv('./source/CSV/yearly_ratings.csv', index=False) # --> Multi-line plot
+profiler.to_csv(yearly_ratings, './source/CSV/yearly_ratings.csv', index=False) # --> Multi-line plot
+
+#Mergeable rating distributions per firm and year (exact 1-5 histograms + quantile sketches)
+with profiler.stage('rating_distributions') as stage:
+    rating_distributions = summarise_ratings(df_reviews, rating_cols)
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(rating_distributions, './source/CSV/rating_distributions.csv', index=False) # --> Median and p10/p90 band plot
 
 #Tracking EmpAt category count changes over time
 def monthly_empat_count(df, col):
@@ -78,90 +99,106 @@ def monthly_empat_count(df, col):
       df[df[col].notna()].groupby(['year_month', col]).size().reset_index(name='count')
   )
 
-pros_time = monthly_empat_count(df_reviews, 'top_pros_category')
-cons_time = monthly_empat_count(df_reviews, 'top_cons_category')
-category_col = 'top_category'
-pros_time = pros_time.rename(columns={'top_pros_category': category_col}) #Rename for before merging
-cons_time = cons_time.rename(columns={'top_cons_category': category_col})
-
-#Combine and sum counts per category
-empat_time_series = (
-    pd.concat([pros_time, cons_time])
-    .groupby(['year_month', category_col])
-    .sum()
-    .reset_index()
-    .pivot(index='year_month', columns=category_col, values='count')
-    .fillna(0)
-)
-
-empat_time_series.to_csv('./source/CSV/empat_time_series.csv') # --> Stacked-line plot 
+with profiler.stage('empat_time_series') as stage:
+    pros_time = monthly_empat_count(df_reviews, 'top_pros_category')
+    cons_time = monthly_empat_count(df_reviews, 'top_cons_category')
+    category_col = 'top_category'
+    pros_time = pros_time.rename(columns={'top_pros_category': category_col}) #Rename for before merging
+    cons_time = cons_time.rename(columns={'top_cons_category': category_col})
+
+    #Combine and sum counts per category
+    empat_time_series = (
+        pd.concat([pros_time, cons_time])
+        .groupby(['year_month', category_col])
+        .sum()
+        .reset_index()
+        .pivot(index='year_month', columns=category_col, values='count')
+        .fillna(0)
+    )
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(empat_time_series, './source/CSV/empat_time_series.csv') # --> Stacked-line plot 
 
 # ===== EMPAT PANEL =====
 #Rank firms by how frequently each EmpAt value is tagged in pros
-firm_profile_fit = []
+with profiler.stage('profile_fit') as stage:
+    firm_profile_fit = []
 
-for cat in display_categories:
-    df_cat = df_reviews.groupby('firm').agg({
-        f'pros_{cat}': 'sum',
-        'pros_cat': 'count'  #counts total reviews per firm
-    }).reset_index()
-    df_cat[f'{cat}_fit'] = round((df_cat[f'pros_{cat}'] / df_cat['pros_cat']) * 100, 2)
-    df_cat = df_cat[['firm', f'{cat}_fit']]
-    firm_profile_fit.append(df_cat)
+    for cat in display_categories:
+        df_cat = df_reviews.groupby('firm').agg({
+            f'pros_{cat}': 'sum',
+            'pros_cat': 'count'  #counts total reviews per firm
+        }).reset_index()
+        df_cat[f'{cat}_fit'] = round((df_cat[f'pros_{cat}'] / df_cat['pros_cat']) * 100, 2)
+        df_cat = df_cat[['firm', f'{cat}_fit']]
+        firm_profile_fit.append(df_cat)
 
-df_profile_fit = reduce(lambda left, right: pd.merge(left, right, on='firm'), firm_profile_fit)
-df_profile_fit.to_csv('./source/CSV/profile_fit.csv', index=False) # --> Horizontal bar graph
+    df_profile_fit = reduce(lambda left, right: pd.merge(left, right, on='firm'), firm_profile_fit)
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(df_profile_fit, './source/CSV/profile_fit.csv', index=False) # --> Horizontal bar graph
 
 #EmpAt sentiment polarity distribution
 #Tracks how often each value is praised (in pros) vs. criticised (in cons)
-empat_sentiment = []
-
-for cat in display_categories:
-    pros_count = df_reviews[f'pros_{cat}'].sum()
-    cons_count = df_reviews[f'cons_{cat}'].sum()
-    total = pros_count + cons_count
-    sentiment_ratio = round((pros_count / total) * 100, 2) if total else 0
-    empat_sentiment.append({
-        'EmpAt Value': cat,
-        'Positive Mentions': int(pros_count),
-        'Negative Mentions': int(cons_count),
-        'Positive %': sentiment_ratio,
-        'Negative %': round(100 - sentiment_ratio, 2)
-    })
+with profiler.stage('sentiment') as stage:
+    empat_sentiment = []
 
-df_empat_sentiment = pd.DataFrame(empat_sentiment)
-df_empat_sentiment.to_csv('./source/CSV/empat_sentdistrib.csv', index=False)  # --> Diverging bar chart
+    for cat in display_categories:
+        pros_count = df_reviews[f'pros_{cat}'].sum()
+        cons_count = df_reviews[f'cons_{cat}'].sum()
+        total = pros_count + cons_count
+        sentiment_ratio = round((pros_count / total) * 100, 2) if total else 0
+        empat_sentiment.append({
+            'EmpAt Value': cat,
+            'Positive Mentions': int(pros_count),
+            'Negative Mentions': int(cons_count),
+            'Positive %': sentiment_ratio,
+            'Negative %': round(100 - sentiment_ratio, 2)
+        })
+
+    df_empat_sentiment = pd.DataFrame(empat_sentiment)
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(df_empat_sentiment, './source/CSV/empat_sentdistrib.csv', index=False)  # --> Diverging bar chart
 
 #Tracks how often EmpAt categories co-occur in the same review
-cooccurrence_counter = Counter()
-for idx, row in df_reviews.iterrows():
-    mentioned_cats = []
-    for cat in display_categories:
-        if row.get(f'pros_{cat}', 0) > 0 or row.get(f'cons_{cat}', 0) > 0:
-            mentioned_cats.append(cat)   
-    if mentioned_cats:
-        for combo in combinations(sorted(set(mentioned_cats)), 2):  #Count unique pair combinations of categories
-            cooccurrence_counter[combo] += 1
+#Each review is encoded as a bitmask of the categories mentioned in its pros or cons
+with profiler.stage('cooccurrence_itemsets') as stage:
+    mentioned = pd.DataFrame({
+        cat: (df_reviews[f'pros_{cat}'] > 0) | (df_reviews[f'cons_{cat}'] > 0) for cat in display_categories
+    })
+    df_reviews['empat_mask'] = encode_masks(mentioned, display_categories)
+    overall_counts = mask_counts(df_reviews['empat_mask'].values, len(display_categories))
 
-cooccurrence_records = []
-for combo, count in cooccurrence_counter.items():
-    cooccurrence_records.append({'Parent': combo[0], 'Child': combo[1], 'Count': count})
+    df_cooccurrence = pair_counts(overall_counts, display_categories)  #Unique pair combinations of categories
 
-df_cooccurrence = pd.DataFrame(cooccurrence_records)
-df_cooccurrence.to_csv('./source/CSV/cooccurrence_network.csv', index=False)  # --> Network diagram
+    #Two- to four-way EmpAt combinations with support and lift (same thresholds as the dashboard chart)
+    df_itemsets = mine_itemsets(
+        overall_counts, display_categories, min_size=2, max_size=4, min_support=MIN_SUPPORT, min_lift=MIN_LIFT)
+
+    #Per-firm mask histograms so the dashboard can mine any firm on demand
+    df_itemset_masks = firm_mask_counts(df_reviews['firm'], df_reviews['empat_mask'].values)
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(df_cooccurrence, './source/CSV/cooccurrence_network.csv', index=False)  # --> Network diagram
+profiler.to_csv(df_itemsets, './source/CSV/empat_itemsets.csv', index=False)
+profiler.to_csv(df_itemset_masks, './source/CSV/empat_itemset_masks.csv', index=False)  # --> Itemset bar chart
 
 #Track which EmpAt values are rarely mentioned in either pros or cons
-neglect_data = []
-
-for cat in display_categories:
-    pros_count = df_reviews[f'pros_{cat}'].sum()
-    cons_count = df_reviews[f'cons_{cat}'].sum()
-    total = pros_count + cons_count
-    neglect_data.append({
-        'EmpAt Value': cat,
-        'Total Mentions': int(total)
-    })
+with profiler.stage('neglect') as stage:
+    neglect_data = []
 
-df_neglect = pd.DataFrame(neglect_data).sort_values(by='Total Mentions', ascending=True)
-df_neglect.to_csv('./source/CSV/neglect_index.csv', index=False)  # --> Radial Column Chart
+    for cat in display_categories:
+        pros_count = df_reviews[f'pros_{cat}'].sum()
+        cons_count = df_reviews[f'cons_{cat}'].sum()
+        total = pros_count + cons_count
+        neglect_data.append({
+            'EmpAt Value': cat,
+            'Total Mentions': int(total)
+        })
+
+    df_neglect = pd.DataFrame(neglect_data).sort_values(by='Total Mentions', ascending=True)
+    stage.rows = len(df_reviews)
+
+profiler.to_csv(df_neglect, './source/CSV/neglect_index.csv', index=False)  # --> Radial Column Chart
 
@@ -0,0 +1,101 @@
+#Latency/accuracy benchmark for the EmpAt model and its compressed variants
+#Run from the Source directory: python bench_empat.py [--student ./saved_empat_student] [--corpus ./cleaned_glassdoor_reviews.csv]
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from transformers import BertTokenizerFast
+from sklearn.metrics import f1_score
+
+from train_empat import MODEL_PATH, MAX_LEN, THRESHOLD, empat_categories, load_labelled_data, split_indices
+from compress_empat import load_model, quantize_model, predict_probs, load_corpus
+
+def model_size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+def measure_latency(model, tokenizer, texts, warmup=5):
+    #Single-review requests, as when labelling one review at a time (warm-up shrinks for tiny samples)
+    warmup = min(warmup, len(texts) - 1)
+    timings = []
+    with torch.no_grad():
+        for i, text in enumerate(texts):
+            start = time.perf_counter()
+            encodings = tokenizer(text, max_length=MAX_LEN, truncation=True, return_tensors='pt')
+            model(**encodings)
+            if i >= warmup:
+                timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000, np.percentile(timings, 99) * 1000
+
+def measure_throughput(model, tokenizer, texts, batch_size):
+    start = time.perf_counter()
+    predict_probs(model, tokenizer, texts, batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+def evaluate_variant(name, model, tokenizer, eval_texts, eval_labels, timing_texts, args):
+    probs = predict_probs(model, tokenizer, eval_texts, args.batch_size)
+    preds = (probs > THRESHOLD).astype(int)
+    gold = eval_labels.astype(int)
+    p50, p99 = measure_latency(model, tokenizer, timing_texts[:args.latency_samples])
+    row = {
+        'variant': name,
+        'size_mb': round(model_size_mb(model), 1),
+        'samples_per_sec': round(measure_throughput(model, tokenizer, timing_texts, args.batch_size), 1),
+        'p50_ms': round(p50, 2),
+        'p99_ms': round(p99, 2),
+        'f1_micro': round(f1_score(gold, preds, average='micro', zero_division=0), 4),
+    }
+    per_category = f1_score(gold, preds, average=None, zero_division=0)
+    for cat, score in zip(empat_categories, per_category):
+        row[f'f1_{cat}'] = round(score, 4)
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EmpAt model variants at the 0.3 threshold")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--student', default=None, help="Distilled student directory (from compress_empat.py distill)")
+    parser.add_argument('--data', default='./CSV/empat_training_data.csv', help="Labelled CSV for F1")
+    parser.add_argument('--split', choices=['val', 'all'], default='val', help="'val' uses the train_empat.py hold-out")
+    parser.add_argument('--val-fraction', type=float, default=0.2, help="Must match the train_empat.py run")
+    parser.add_argument('--seed', type=int, default=42, help="Must match the train_empat.py run")
+    parser.add_argument('--corpus', default=None, help="Cleaned reviews CSV for timing (default: labelled texts)")
+    parser.add_argument('--timing-samples', type=int, default=2000)
+    parser.add_argument('--latency-samples', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--out', default=None, help="Optional CSV path for the results table")
+    args = parser.parse_args()
+    if args.latency_samples < 1:
+        parser.error("--latency-samples must be at least 1")
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts, labels = load_labelled_data(args.data)
+    if args.split == 'val':
+        _, val_idx = split_indices(len(texts), args.val_fraction, args.seed)
+        texts, labels = [texts[i] for i in val_idx], labels[val_idx]
+    if args.corpus:
+        timing_texts = load_corpus(args.corpus, args.timing_samples)
+    else:
+        timing_texts = (texts * (args.timing_samples // max(len(texts), 1) + 1))[:args.timing_samples]
+
+    tokenizer = BertTokenizerFast.from_pretrained(args.model)
+    baseline = load_model(args.model)
+    variants = [('baseline fp32', baseline), ('baseline int8', quantize_model(baseline))]
+    if args.student:
+        student = load_model(args.student)
+        variants += [('student fp32', student), ('student int8', quantize_model(student))]
+
+    rows = [evaluate_variant(name, model, tokenizer, texts, labels, timing_texts, args) for name, model in variants]
+    df_bench = pd.DataFrame(rows)
+    print(df_bench.to_string(index=False))
+    if args.out:
+        df_bench.to_csv(args.out, index=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#Measures callback response size (raw and gzipped) and serialization time per JSON engine
+#The first row per callback is the engine the dashboard ships with (configure_json_engine)
+#Run from the Source directory: python bench_serialization.py [--repeat 50]
+import argparse
+import gzip
+import time
+
+import pandas as pd
+import plotly.io as pio
+from _plotly_utils.optional_imports import get_module
+
+import dashboard
+
+def as_tuple(result):
+    return result if isinstance(result, tuple) else (result,)
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        timings.append(time.perf_counter() - start)
+    return out, sorted(timings)[len(timings) // 2] * 1000  #Median in ms
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    shipped = pio.json.config.default_engine  #Set by configure_json_engine() when dashboard was imported
+    engines = [shipped] + [e for e in ['json', 'orjson'] if e != shipped and (e == 'json' or get_module(e))]
+    firm = dashboard.firms[0]
+    callbacks = {
+        'update_overview': (dashboard.update_overview, (firm, False)),
+        'update_temporal_ratings': (dashboard.update_temporal_ratings, (firm, False)),
+        'update_temporal': (dashboard.update_temporal, ('/temporal', False)),
+        'update_empat_profile': (dashboard.update_empat_profile, ('Economic Value_fit', False)),
+        'update_empat': (dashboard.update_empat, ('/empat', False)),
+        'update_itemsets': (dashboard.update_itemsets, ('All Firms', 3, False)),
+        'update_rating_distribution': (dashboard.update_rating_distribution, (firm, 'overall_rating', False)),
+    }
+
+    rows = []
+    for name, (callback, callback_args) in callbacks.items():
+        figs = list(as_tuple(callback(*callback_args)))
+        for engine in engines:
+            payload, ms = time_call(lambda: pio.json.to_json_plotly(figs, engine=engine), args.repeat)
+            raw = payload.encode('utf-8')
+            rows.append({
+                'callback': name,
+                'engine': f'{engine} (dashboard)' if engine == shipped else engine,
+                'bytes': len(raw),
+                'gzip_bytes': len(gzip.compress(raw)),
+                'serialize_ms': round(ms, 2),
+            })
+
+    df_bench = pd.DataFrame(rows)
+    print(df_bench.to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#Smaller variants of the saved EmpAt model for bulk CPU labelling
+#Run from the Source directory:
+#  python compress_empat.py quantize                      -> ./saved_empat_model_int8.pt
+#  python compress_empat.py distill --sample 200000       -> ./saved_empat_student
+import argparse
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from torch.optim import AdamW
+from transformers import BertTokenizerFast, BertForSequenceClassification
+
+from train_empat import MODEL_PATH, MAX_LEN, EmpatDataset, make_loader
+
+QUANTIZED_PATH = './saved_empat_model_int8.pt'
+STUDENT_PATH = './saved_empat_student'
+CORPUS_PATH = './cleaned_glassdoor_reviews.csv'
+
+def load_model(path):
+    model = BertForSequenceClassification.from_pretrained(path)
+    model.eval()
+    return model
+
+def quantize_model(model):
+    #Dynamic int8 quantization: Linear weights stored as int8, activations quantized on the fly
+    return torch.ao.quantization.quantize_dynamic(copy.deepcopy(model), {nn.Linear}, dtype=torch.qint8)
+
+def predict_probs(model, tokenizer, texts, batch_size=32, max_len=MAX_LEN):
+    #Sigmoid outputs for every text; texts are length-sorted so each batch pads as little as possible
+    order = np.argsort([len(t) for t in texts])
+    probs = np.zeros((len(texts), model.config.num_labels), dtype=np.float32)
+    model.eval()
+    with torch.no_grad():
+        for i in range(0, len(texts), batch_size):
+            idx = order[i:i + batch_size]
+            encodings = tokenizer([texts[j] for j in idx], max_length=max_len, padding=True,
+                                  truncation=True, return_tensors='pt')
+            outputs = model(input_ids=encodings['input_ids'], attention_mask=encodings['attention_mask'])
+            probs[idx] = torch.sigmoid(outputs.logits).numpy()
+    return probs
+
+def load_corpus(path, sample=None, seed=42):
+    #Pros and cons of the cleaned reviews, one text per entry
+    df = pd.read_csv(path, usecols=['pros', 'cons'])
+    texts = pd.concat([df['pros'], df['cons']]).dropna().astype(str)
+    texts = texts[texts.str.strip().str.len() > 0]
+    if sample and sample < len(texts):
+        texts = texts.sample(n=sample, random_state=seed)
+    return texts.tolist()
+
+def init_student(teacher, num_layers):
+    #DistilBERT-style init: keep the teacher's embeddings/pooler/classifier and an evenly spaced subset of layers
+    config = copy.deepcopy(teacher.config)
+    config.num_hidden_layers = num_layers
+    student = BertForSequenceClassification(config)
+    keep = np.linspace(0, teacher.config.num_hidden_layers - 1, num_layers).round().astype(int)
+    student_state = student.state_dict()
+    for key, value in teacher.state_dict().items():
+        if '.layer.' in key:
+            prefix, rest = key.split('.layer.', 1)
+            layer, suffix = rest.split('.', 1)
+            if int(layer) not in keep:
+                continue
+            key = f"{prefix}.layer.{list(keep).index(int(layer))}.{suffix}"
+        if key in student_state:
+            student_state[key] = value.clone()
+    student.load_state_dict(student_state)
+    return student
+
+def distill(args):
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    torch.manual_seed(args.seed)
+
+    tokenizer = BertTokenizerFast.from_pretrained(args.teacher)
+    teacher = load_model(args.teacher)
+    texts = load_corpus(args.corpus, args.sample, args.seed)
+
+    start = time.perf_counter()
+    soft_labels = predict_probs(teacher, tokenizer, texts, args.batch_size * 4, args.max_len)
+    print(f"Teacher labelled {len(texts)} texts in {time.perf_counter() - start:.1f}s")
+
+    if args.student_name:
+        student = BertForSequenceClassification.from_pretrained(
+            args.student_name, num_labels=teacher.config.num_labels, problem_type="multi_label_classification")
+    else:
+        student = init_student(teacher, args.student_layers)
+    del teacher
+
+    dataset = EmpatDataset(texts, soft_labels, tokenizer, args.max_len)
+    loader, sampler = make_loader(dataset, list(range(len(dataset))), args.batch_size,
+                                  tokenizer.pad_token_id, args.workers, shuffle=True, seed=args.seed)
+    loss_fn = nn.BCEWithLogitsLoss()  #Soft targets: the teacher's sigmoid probabilities
+    optimizer = AdamW(student.parameters(), lr=args.lr)
+
+    for epoch in range(args.epochs):
+        student.train()
+        sampler.set_epoch(epoch)
+        total_loss, n_samples = 0, 0
+        epoch_start = time.perf_counter()
+        for batch in loader:
+            optimizer.zero_grad()
+            outputs = student(input_ids=batch['input_ids'], attention_mask=batch['attention_mask'])
+            loss = loss_fn(outputs.logits, batch['labels'])
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item()
+            n_samples += batch['input_ids'].size(0)
+        elapsed = time.perf_counter() - epoch_start
+        print(f"Epoch {epoch+1}/{args.epochs} | Distillation Loss: {total_loss / max(len(loader), 1):.4f} "
+              f"({n_samples / elapsed:.1f} samples/sec)")
+
+    student.save_pretrained(args.output)
+    tokenizer.save_pretrained(args.output)
+
+def quantize(args):
+    model = quantize_model(load_model(args.model))
+    torch.save(model, args.output)  #Whole module: load with torch.load(path, weights_only=False)
+    print(f"Saved int8 model to {args.output}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress the saved EmpAt classifier")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    q = commands.add_parser('quantize', help="Dynamic int8 quantization of the Linear layers")
+    q.add_argument('--model', default=MODEL_PATH)
+    q.add_argument('--output', default=QUANTIZED_PATH)
+
+    d = commands.add_parser('distill', help="Train a smaller student on the teacher's sigmoid outputs")
+    d.add_argument('--teacher', default=MODEL_PATH)
+    d.add_argument('--corpus', default=CORPUS_PATH, help="Cleaned reviews CSV with pros/cons columns")
+    d.add_argument('--sample', type=int, default=None, help="Number of texts to distill on (default: all)")
+    d.add_argument('--student-name', default=None, help="Pretrained small BERT sharing the bert-base-uncased vocab")
+    d.add_argument('--student-layers', type=int, default=4, help="Layers kept from the teacher when no --student-name")
+    d.add_argument('--output', default=STUDENT_PATH)
+    d.add_argument('--epochs', type=int, default=2)
+    d.add_argument('--batch-size', type=int, default=32)
+    d.add_argument('--lr', type=float, default=5e-5)
+    d.add_argument('--max-len', type=int, default=MAX_LEN)
+    d.add_argument('--workers', type=int, default=0)
+    d.add_argument('--threads', type=int, default=0)
+    d.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.command == 'quantize':
+        quantize(args)
+    else:
+        distill(args)
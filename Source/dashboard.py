@@ -10,6 +10,10 @@ import matplotlib.pyplot as plt
 import base64
 from io import BytesIO
 from math import pi
+import os
+from serialization import compression_enabled, configure_json_engine
+from itemsets import masks_from_reviews, firm_mask_counts, counts_from_histogram, mine_itemsets, MIN_SUPPORT, MIN_LIFT
+from rating_stats import summarise_ratings
 
 def get_dropdown_style(width="60%", margin="auto"):
     return {
@@ -44,10 +48,25 @@ df_empat_sentiment = pd.read_csv('./CSV/empat_sentdistrib.csv')
 df_cooccurrence = pd.read_csv('./CSV/cooccurrence_network.csv')
 df_neglect = pd.read_csv('./CSV/neglect_index.csv')
 
+#Bit order of the itemset masks (same as display_categories in analysis.py)
+display_categories = ["Economic Value", "Interest Value", "Social Value", "Development Value", "Application Value"]
+if os.path.exists('./CSV/empat_itemset_masks.csv'):
+    df_itemset_masks = pd.read_csv('./CSV/empat_itemset_masks.csv')
+else:  #Derive the per-firm mask histograms once if analysis.py has not written them yet
+    df_itemset_masks = firm_mask_counts(df_reviews['firm'], masks_from_reviews(df_reviews, display_categories))
+
+rating_cols = ['overall_rating', 'work_life_balance', 'culture_values', 'career_opp', 'comp_benefits', 'senior_mgmt']
+if os.path.exists('./CSV/rating_distributions.csv'):
+    df_rating_dist = pd.read_csv('./CSV/rating_distributions.csv')
+else:  #Summarise once from df_reviews if analysis.py has not written the distributions yet
+    df_rating_dist = summarise_ratings(
+        df_reviews.assign(year=pd.to_datetime(df_reviews['year_month'], errors='coerce').dt.year), rating_cols)
+
 firms = df_reviews['firm'].unique()
 
 #Start dashboard
-dashboard = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.themes.DARKLY])
+configure_json_engine()
+dashboard = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.themes.DARKLY], compress=compression_enabled())
 dashboard.title = "Glassdoor Insights Dashboard"
 
 theme_toggle = html.Div([
@@ -115,6 +134,21 @@ def temporal_layout(theme_value):
             ], style={**get_card_style(dark_mode), 'flex': '1 1 500px'})
         ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'center'}),
 
+        html.Div([  #Rating distribution: median with p10/p90 band for the selected firm
+            html.Div([
+                html.Div([
+                    dcc.Dropdown(
+                        id='rating-column-dropdown',
+                        options=[{'label': col.replace('_', ' ').title(), 'value': col} for col in rating_cols],
+                        value='overall_rating',
+                        clearable=False,
+                        style={'width': '60%', 'margin': '0 auto 30px', 'color': 'black'}
+                    ),
+                    dcc.Graph(id='ratings-distribution')
+                ])
+            ], style={**get_card_style(dark_mode), 'flex': '1 1 500px'})
+        ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'center'}),
+
         html.Div([
             html.Div(dcc.Graph(id='empat-time-series'),style=get_card_style(dark_mode)),
             html.Div(dcc.Graph(id='topic-trends'),style=get_card_style(dark_mode))
@@ -147,6 +181,28 @@ def empat_layout(theme_value):
             html.Div(dcc.Graph(id='cooccurrence-network'),style={**get_card_style(dark_mode), 'flex': '1 1 480px', 'minWidth': '400px'})
         ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'center'}),
 
+        html.Div([  #Top EmpAt combinations (itemsets) per firm
+            html.Div([
+                html.Div([
+                    dcc.Dropdown(
+                        id='itemset-firm-dropdown',
+                        options=[{'label': 'All Firms', 'value': 'All Firms'}] + [{'label': firm, 'value': firm} for firm in firms],
+                        value='All Firms',
+                        clearable=False,
+                        style=get_dropdown_style(width="100%", margin="0 0 10px 0")
+                    ),
+                    dcc.RadioItems(
+                        id='itemset-size',
+                        options=[{'label': f' {n}+ values ', 'value': n} for n in [2, 3, 4]],
+                        value=3,
+                        inline=True,
+                        style={'marginBottom': '10px'}
+                    ),
+                    dcc.Graph(id='itemset-bar')
+                ])
+            ], style={**get_card_style(dark_mode), 'flex': '1 1 500px'})
+        ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'center'}),
+
         html.Div([  # Radial chart full width
             html.Div(dcc.Graph(id='neglect-radial'),style={**get_card_style(dark_mode), 'maxWidth': '960px', 'margin': '20px auto'})
         ])
@@ -334,6 +390,43 @@ def update_temporal_ratings(selected_firm, theme_value):
     )
     return fig
 
+@dashboard.callback(
+    Output('ratings-distribution', 'figure'),
+    Input('ratings-firm-dropdown', 'value'),
+    Input('rating-column-dropdown', 'value'),
+    Input('dark-mode-toggle', 'value')
+)
+def update_rating_distribution(selected_firm, rating_col, theme_value):
+    dark_mode = theme_value
+    dist = df_rating_dist[(df_rating_dist['firm'] == selected_firm) & (df_rating_dist['rating'] == rating_col)].sort_values('year')
+
+    # ==== MEDIAN WITH P10/P90 BAND ====
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dist['year'], y=dist['p90'], mode='lines', line=dict(width=0),
+        name='p90', hoverinfo='skip', showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=dist['year'], y=dist['p10'], mode='lines', line=dict(width=0),
+        fill='tonexty', fillcolor='rgba(199,21,133,0.2)', name='p10 - p90'
+    ))
+    fig.add_trace(go.Scatter(
+        x=dist['year'], y=dist['median'], mode='lines+markers', line=dict(color='mediumvioletred'),
+        name='Median', customdata=dist[['n', 'mean', 'p10', 'p90']],
+        hovertemplate='%{x}: median %{y}<br>p10 %{customdata[2]} - p90 %{customdata[3]}'
+                      '<br>mean %{customdata[1]}, %{customdata[0]} reviews<extra></extra>'
+    ))
+    fig.update_layout(
+        template='plotly_dark' if dark_mode else 'plotly',
+        title=f"{selected_firm} - {rating_col.replace('_', ' ').title()} Distribution Over Time",
+        xaxis_title="Year",
+        yaxis=dict(title="Rating", range=[0.8, 5.2]),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color='white' if dark_mode else 'black')
+    )
+    return fig
+
 @dashboard.callback(
     Output('empat-time-series', 'figure'),
     Output('topic-trends', 'figure'),
@@ -568,6 +661,43 @@ def update_empat(pathname, theme_value):
 
     return emp_fig2, emp_fig3, emp_fig4
 
+@dashboard.callback(
+    Output('itemset-bar', 'figure'),
+    Input('itemset-firm-dropdown', 'value'),
+    Input('itemset-size', 'value'),
+    Input('dark-mode-toggle', 'value')
+)
+def update_itemsets(selected_firm, min_size, theme_value):
+    dark_mode = theme_value
+
+    # ==== TOP EMPAT COMBINATIONS BAR ====
+    firm = None if selected_firm == 'All Firms' else selected_firm
+    counts = counts_from_histogram(df_itemset_masks, len(display_categories), firm)
+    df_sets = mine_itemsets(
+        counts, display_categories, min_size=min_size, max_size=4, min_support=MIN_SUPPORT, min_lift=MIN_LIFT).head(15)
+
+    fig = px.bar(
+        df_sets,
+        x='Support %',
+        y='Itemset',
+        orientation='h',
+        color='Lift',
+        color_continuous_scale=px.colors.sequential.Tealgrn,
+        hover_data=['Count', 'Lift'],
+        title=f"Top EmpAT Combinations - {selected_firm} (support ≥ {MIN_SUPPORT:g}%, lift ≥ {MIN_LIFT:g})",
+        category_orders={"Itemset": df_sets['Itemset'].tolist()}
+    )
+    fig.update_layout(
+        template='plotly_dark' if dark_mode else 'plotly',
+        xaxis_title="% of Reviews",
+        yaxis_title="",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color='white' if dark_mode else 'black'),
+        margin=dict(l=100, r=20, t=60, b=40)
+    )
+    return fig
+
 @dashboard.callback(
     Output('page-content', 'style'),
     Input('dark-mode-toggle', 'value')
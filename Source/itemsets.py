@@ -0,0 +1,93 @@
+#Frequent EmpAt itemset mining over bitset-encoded reviews
+#Each review is reduced to a bitmask of the EmpAt categories it mentions (bit i = categories[i]).
+#With 5 categories there are only 32 masks, so a group of reviews (overall or one firm) is summarised
+#by a 32-bin histogram and every itemset's support comes from one superset-sum pass over it.
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+#Default thresholds for ranked itemsets: in at least 1% of reviews, and co-occurring at least as often as
+#independent mentions would (lift >= 1)
+MIN_SUPPORT = 1.0
+MIN_LIFT = 1.0
+
+def encode_masks(mentioned, categories):
+    #mentioned: DataFrame of booleans with one column per category
+    masks = np.zeros(len(mentioned), dtype=np.int64)
+    for bit, cat in enumerate(categories):
+        masks |= mentioned[cat].to_numpy(dtype=bool).astype(np.int64) << bit
+    return masks
+
+def masks_from_reviews(df, categories):
+    #Masks straight from the stringified pros_cat/cons_cat dicts in df_reviews.csv (keys are the predicted categories)
+    mentioned = pd.DataFrame({
+        cat: df['pros_cat'].astype(str).str.contains(f"'{cat}'", regex=False)
+        | df['cons_cat'].astype(str).str.contains(f"'{cat}'", regex=False)
+        for cat in categories
+    })
+    return encode_masks(mentioned, categories)
+
+def mask_counts(masks, n_items):
+    return np.bincount(masks, minlength=1 << n_items)
+
+def firm_mask_counts(firms, masks):
+    #Long format (firm, mask, count) histogram, small enough to ship as a CSV
+    return (
+        pd.DataFrame({'firm': np.asarray(firms), 'mask': masks})
+        .groupby(['firm', 'mask']).size().reset_index(name='count')
+    )
+
+def counts_from_histogram(df_masks, n_items, firm=None):
+    if firm is not None:
+        df_masks = df_masks[df_masks['firm'] == firm]
+    counts = np.zeros(1 << n_items, dtype=np.int64)
+    np.add.at(counts, df_masks['mask'].to_numpy(), df_masks['count'].to_numpy())
+    return counts
+
+def itemset_support(counts, n_items):
+    #Superset-sum transform: support[s] = number of reviews whose mask contains every bit of s
+    support = counts.astype(np.int64).copy()
+    all_masks = np.arange(1 << n_items)
+    for bit in range(n_items):
+        without_bit = all_masks[(all_masks & (1 << bit)) == 0]
+        support[without_bit] += support[without_bit | (1 << bit)]
+    return support
+
+def mine_itemsets(counts, categories, min_size=2, max_size=4, min_support=0.0, min_lift=0.0):
+    #Itemsets of min_size..max_size items with support (% of reviews) and lift over independence
+    n_items = len(categories)
+    support = itemset_support(counts, n_items)
+    total = support[0]  #The empty itemset is contained in every review
+    records = []
+    if total == 0:
+        return pd.DataFrame(columns=['Itemset', 'Size', 'Count', 'Support %', 'Lift'])
+    item_share = [support[1 << bit] / total for bit in range(n_items)]
+    for size in range(min_size, max_size + 1):
+        for bits in combinations(range(n_items), size):
+            mask = sum(1 << bit for bit in bits)
+            share = support[mask] / total
+            expected = np.prod([item_share[bit] for bit in bits])
+            lift = share / expected if expected else 0.0
+            if share * 100 < min_support or lift < min_lift or support[mask] == 0:
+                continue
+            records.append({
+                'Itemset': ' + '.join(categories[bit] for bit in bits),
+                'Size': size,
+                'Count': int(support[mask]),
+                'Support %': round(share * 100, 2),
+                'Lift': round(lift, 3),
+            })
+    return pd.DataFrame(records, columns=['Itemset', 'Size', 'Count', 'Support %', 'Lift']).sort_values(
+        by='Count', ascending=False, ignore_index=True)
+
+def pair_counts(counts, categories):
+    #Pair co-occurrence counts in the cooccurrence_network.csv layout (alphabetical Parent/Child)
+    support = itemset_support(counts, len(categories))
+    records = []
+    for a, b in combinations(range(len(categories)), 2):
+        count = int(support[(1 << a) | (1 << b)])
+        if count:
+            parent, child = sorted([categories[a], categories[b]])
+            records.append({'Parent': parent, 'Child': child, 'Count': count})
+    return pd.DataFrame(records, columns=['Parent', 'Child', 'Count'])
@@ -5,33 +5,40 @@ nltk.data.path.append("C:/Users/tasni/nltk_data")
 from nltk.corpus import stopwords
 from nltk.tokenize import TreebankWordTokenizer
 from nltk.stem import WordNetLemmatizer
+from profiling import RunProfiler
+
+profiler = RunProfiler('proc_dataset')  #Opt-in: set PIPELINE_PROFILE=1 to write a run manifest
 
 #Load the dataset
 file_path = './Source/glassdoor_reviews.csv'
-df = pd.read_csv(file_path)
+df = profiler.read_csv(file_path)
 
 #Handle Missing Values
-#Drop rows where essential columns are missing
-df.dropna(subset=['firm', 'headline', 'pros', 'cons', 'overall_rating'], inplace=True)
+with profiler.stage('missing_values') as stage:
+    #Drop rows where essential columns are missing
+    df.dropna(subset=['firm', 'headline', 'pros', 'cons', 'overall_rating'], inplace=True)
 
-#Fill missing categorical values with 'o' (No Opinion)
-categorical_cols = ['recommend', 'ceo_approv', 'outlook']
-df[categorical_cols] = df[categorical_cols].fillna('o')
+    #Fill missing categorical values with 'o' (No Opinion)
+    categorical_cols = ['recommend', 'ceo_approv', 'outlook']
+    df[categorical_cols] = df[categorical_cols].fillna('o')
+    stage.rows = len(df)
 
 
 #Correct Formatting
-#Convert date_review to datetime format
-df['date_review'] = pd.to_datetime(df['date_review'])
+with profiler.stage('formatting') as stage:
+    #Convert date_review to datetime format
+    df['date_review'] = pd.to_datetime(df['date_review'])
 
-#Convert ratings to numeric
-rating_cols = ['work_life_balance', 'culture_values', 'diversity_inclusion', 'career_opp', 'comp_benefits', 'senior_mgmt']
-df[rating_cols] = df[rating_cols].astype(float)
+    #Convert ratings to numeric
+    rating_cols = ['work_life_balance', 'culture_values', 'diversity_inclusion', 'career_opp', 'comp_benefits', 'senior_mgmt']
+    df[rating_cols] = df[rating_cols].astype(float)
 
-#Map categorical ranking values
-category_mapping = {'v': 'Positive', 'r': 'Mild', 'x': 'Negative', 'o': 'No Opinion'}
-df['recommend'] = df['recommend'].map(category_mapping)
-df['ceo_approv'] = df['ceo_approv'].map(category_mapping)
-df['outlook'] = df['outlook'].map(category_mapping)
+    #Map categorical ranking values
+    category_mapping = {'v': 'Positive', 'r': 'Mild', 'x': 'Negative', 'o': 'No Opinion'}
+    df['recommend'] = df['recommend'].map(category_mapping)
+    df['ceo_approv'] = df['ceo_approv'].map(category_mapping)
+    df['outlook'] = df['outlook'].map(category_mapping)
+    stage.rows = len(df)
 
 #Text Preprocessing
 #Ensure stopwords and tokenizer are downloaded
@@ -47,11 +54,13 @@ def clean_text(text):
     return ' '.join(tokens)
 
 # Apply cleaning function
-df['headline'] = df['headline'].astype(str).apply(clean_text)
-df['pros'] = df['pros'].astype(str).apply(clean_text)
-df['cons'] = df['cons'].astype(str).apply(clean_text)
-df['current'] =df['current'].astype(str).apply(clean_text)
-df['location'] =df['location'].astype(str).apply(clean_text)
-df['job_title'] =df['job_title'].astype(str).apply(clean_text)
-
-df.to_csv("./Source/cleaned_glassdoor_reviews.csv", index=False)
+with profiler.stage('clean_text') as stage:
+    df['headline'] = df['headline'].astype(str).apply(clean_text)
+    df['pros'] = df['pros'].astype(str).apply(clean_text)
+    df['cons'] = df['cons'].astype(str).apply(clean_text)
+    df['current'] =df['current'].astype(str).apply(clean_text)
+    df['location'] =df['location'].astype(str).apply(clean_text)
+    df['job_title'] =df['job_title'].astype(str).apply(clean_text)
+    stage.rows = len(df)
+
+profiler.to_csv(df, "./Source/cleaned_glassdoor_reviews.csv", index=False)
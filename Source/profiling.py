@@ -0,0 +1,235 @@
+#Opt-in stage profiling for the offline pipeline scripts (proc_dataset.py, analysis.py, topic_tagger.py)
+#and the notebook's inference and clustering cells. Scripts write the manifest at exit; atexit does not run
+#in a live Jupyter kernel, so notebook cells call profiler.write() themselves.
+#Off unless PIPELINE_PROFILE is set:
+#  PIPELINE_PROFILE=1                  -> ./profiles/<script>-<timestamp>.json
+#  PIPELINE_PROFILE=some/dir           -> some/dir/<script>-<timestamp>.json
+#  PIPELINE_PROFILE=run.json           -> run.json
+#  PIPELINE_PROFILE_SAMPLE=1           -> also write collapsed stacks (flamegraph input) for the slowest stage
+import atexit
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  #Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() not in ('', '0', 'false', 'no')
+
+def peak_rss_mb():
+    #Process-wide peak resident set size so far (None when neither resource nor psutil is available)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)  #bytes on macOS, KiB on Linux
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+    return None
+
+def current_rss_mb():
+    #Resident set size right now: /proc/self/statm on Linux, psutil elsewhere (None if neither is available)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+class StackSampler:
+    #Minimal sampling profiler: a background thread records the target thread's stack every interval seconds
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+class RssPoller:
+    #Background thread recording the highest RSS seen between start() and stop()
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _poll(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak_mb = rss if self.peak_mb is None else max(self.peak_mb, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._poll()
+
+    def start(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        if self.start_mb is not None:
+            self._thread.start()
+
+    def stop(self):
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+            self._poll()
+
+class StageRecord:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_mb = None
+        self.rss_delta_mb = None
+        self.rows = None
+        self.inputs = {}
+        self.outputs = {}
+        self.stacks = Counter()
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_s': round(self.wall_s, 4),
+            'cpu_s': round(self.cpu_s, 4),
+            'peak_rss_mb': self.peak_rss_mb,
+            'rss_delta_mb': self.rss_delta_mb,
+            'rows': self.rows,
+            'inputs': self.inputs,
+            'outputs': self.outputs,
+        }
+
+class RunProfiler:
+    def __init__(self, name, enabled=None, sample=None):
+        self.name = name
+        self.enabled = env_flag('PIPELINE_PROFILE') if enabled is None else enabled
+        self.sample = env_flag('PIPELINE_PROFILE_SAMPLE') if sample is None else sample
+        self.stages = {}
+        self.started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._written = False
+        if self.enabled:
+            atexit.register(self.write)
+
+    @contextmanager
+    def stage(self, name, inputs=(), outputs=()):
+        #Times a named stage; set record.rows inside the block. Repeated names accumulate times, and keep
+        #the largest in-stage peak RSS and growth over the stage's starting RSS across calls.
+        record = self.stages.setdefault(name, StageRecord(name))
+        if not self.enabled:
+            yield record
+            return
+        sampler = StackSampler(threading.get_ident()) if self.sample else None
+        if sampler:
+            sampler.start()
+        poller = RssPoller()
+        poller.start()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_s += time.perf_counter() - wall_start
+            record.cpu_s += time.process_time() - cpu_start
+            record.calls += 1
+            poller.stop()
+            if poller.peak_mb is not None:
+                record.peak_rss_mb = max(record.peak_rss_mb or 0.0, round(poller.peak_mb, 1))
+                record.rss_delta_mb = max(record.rss_delta_mb or 0.0, round(poller.peak_mb - poller.start_mb, 1))
+            if sampler:
+                sampler.stop()
+                record.stacks.update(sampler.stacks)
+            for path in inputs:
+                record.inputs[str(path)] = file_size(path)
+            for path in outputs:
+                record.outputs[str(path)] = file_size(path)
+
+    def read_csv(self, path, stage='read_csv', **kwargs):
+        import pandas as pd
+        with self.stage(stage, inputs=[path]) as record:
+            df = pd.read_csv(path, **kwargs)
+            record.rows = (record.rows or 0) + len(df)
+        return df
+
+    def to_csv(self, df, path, stage='write_csv', **kwargs):
+        with self.stage(stage, outputs=[path]) as record:
+            df.to_csv(path, **kwargs)
+            record.rows = (record.rows or 0) + len(df)
+
+    def manifest_path(self):
+        setting = os.environ.get('PIPELINE_PROFILE', '1')
+        if setting.endswith('.json'):
+            return setting
+        directory = './profiles' if setting.lower() in ('1', 'true', 'yes') else setting
+        return os.path.join(directory, f"{self.name}-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+
+    def write(self):
+        if not self.enabled or self._written:
+            return None
+        self._written = True
+        path = self.manifest_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        stages = list(self.stages.values())
+        slowest = max(stages, key=lambda r: r.wall_s, default=None)
+
+        profile_output = None
+        if slowest is not None and slowest.stacks:
+            profile_output = f"{os.path.splitext(path)[0]}.{slowest.name}.collapsed.txt"
+            with open(profile_output, 'w') as f:
+                for stack, count in slowest.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        manifest = {
+            'script': self.name,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'wall_s': round(time.perf_counter() - self._wall_start, 4),
+            'cpu_s': round(time.process_time() - self._cpu_start, 4),
+            'peak_rss_mb': peak_rss_mb(),  #Process high-water mark for the whole run
+            'slowest_stage': slowest.name if slowest else None,
+            'profile_output': profile_output,
+            'stages': [record.to_dict() for record in stages],
+        }
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Run manifest written to {path}")
+        return path
@@ -0,0 +1,115 @@
+#Mergeable per-firm, per-year rating distribution summaries
+#Ratings on the 1-5 scale are kept as exact histograms (n_1..n_5). Any value that is not a whole
+#star (e.g. a 3.5 average) goes into a DDSketch-style quantile sketch: log-spaced buckets with
+#SKETCH_ACCURACY relative error. Both parts merge by adding counts, so summaries built from chunks
+#or incremental runs combine to the same result as one pass over all reviews.
+#Incremental run from the Source directory:
+#  python rating_stats.py --reviews ./CSV/new_reviews.csv --merge ./CSV/rating_distributions.csv
+import argparse
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+RATING_VALUES = [1, 2, 3, 4, 5]
+SKETCH_ACCURACY = 0.01
+GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+KEYS = ['firm', 'year', 'rating']
+COUNT_COLS = ['n', 'sum'] + [f'n_{v}' for v in RATING_VALUES]
+STAT_COLS = ['mean', 'p10', 'median', 'p90']
+
+def sketch_bucket(values):
+    return np.ceil(np.log(values) / math.log(GAMMA)).astype(int)
+
+def bucket_value(bucket):
+    #Representative value of a bucket (within SKETCH_ACCURACY of every value in it)
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+def encode_sketch(counter):
+    return json.dumps({str(k): int(v) for k, v in sorted(counter.items())})
+
+def decode_sketch(text):
+    if not isinstance(text, str) or not text:
+        return Counter()
+    return Counter({int(k): v for k, v in json.loads(text).items()})
+
+def summarise_ratings(df, rating_cols):
+    #One row per (firm, year, rating column) with counts, sum, exact histogram and sketch of other values
+    long = df[['firm', 'year'] + rating_cols].melt(id_vars=['firm', 'year'], var_name='rating', value_name='value')
+    long = long.dropna(subset=['firm', 'year', 'value'])
+    long = long[long['value'] > 0]  #Ratings are 1-5; 0/negative would be data errors
+    long['year'] = long['year'].astype(int)
+
+    summary = long.groupby(KEYS)['value'].agg(n='size', sum='sum')
+    discrete = long['value'].isin(RATING_VALUES)
+    hist = (
+        long[discrete].groupby(KEYS + ['value']).size()
+        .unstack('value').reindex(columns=RATING_VALUES).fillna(0).astype(int)
+    )
+    hist.columns = [f'n_{int(v)}' for v in hist.columns]
+    summary = summary.join(hist).fillna({f'n_{v}': 0 for v in RATING_VALUES})
+
+    other = long[~discrete].copy()
+    other['bucket'] = sketch_bucket(other['value'].to_numpy())
+    buckets = other.groupby(KEYS + ['bucket']).size()
+    sketches = buckets.groupby(level=KEYS).apply(
+        lambda s: encode_sketch(Counter(dict(zip(s.index.get_level_values('bucket'), s.values)))))
+    summary['sketch'] = sketches.reindex(summary.index).fillna('{}') if len(sketches) else '{}'
+
+    summary = summary.reset_index()
+    summary[[f'n_{v}' for v in RATING_VALUES]] = summary[[f'n_{v}' for v in RATING_VALUES]].astype(int)
+    return add_stats(summary)
+
+def merge_summaries(*summaries):
+    #Combine summaries from chunks or earlier runs by adding counts and sketch buckets
+    combined = pd.concat([s[KEYS + COUNT_COLS + ['sketch']] for s in summaries], ignore_index=True)
+    merged = combined.groupby(KEYS)[COUNT_COLS].sum()
+    merged['sketch'] = combined.groupby(KEYS)['sketch'].agg(
+        lambda texts: encode_sketch(sum((decode_sketch(t) for t in texts), Counter())))
+    return add_stats(merged.reset_index())
+
+def quantiles(row, qs):
+    #Nearest-rank quantiles over the exact histogram plus the sketch buckets
+    points = [(v, row[f'n_{v}']) for v in RATING_VALUES if row[f'n_{v}']]
+    points += [(bucket_value(b), c) for b, c in decode_sketch(row['sketch']).items()]
+    points.sort()
+    values = np.array([p[0] for p in points], dtype=float)
+    cumulative = np.cumsum([p[1] for p in points])
+    if not len(cumulative):
+        return [np.nan] * len(qs)
+    return [values[np.searchsorted(cumulative, max(q * cumulative[-1], 1))] for q in qs]
+
+def add_stats(summary):
+    summary = summary.copy()
+    summary['mean'] = (summary['sum'] / summary['n']).round(2)
+    stats = summary.apply(lambda row: quantiles(row, [0.1, 0.5, 0.9]), axis=1, result_type='expand')
+    summary[['p10', 'median', 'p90']] = stats.round(2) if len(summary) else np.nan
+    return summary[KEYS + COUNT_COLS + STAT_COLS + ['sketch']].sort_values(KEYS, ignore_index=True)
+
+def summarise_ratings_csv(path, rating_cols, chunksize=500_000):
+    #Chunked pass over a reviews CSV with a year_month column
+    chunks = []
+    for chunk in pd.read_csv(path, usecols=['firm', 'year_month'] + rating_cols, chunksize=chunksize):
+        chunk['year'] = pd.to_datetime(chunk['year_month'], errors='coerce').dt.year
+        chunks.append(summarise_ratings(chunk, rating_cols))
+    return merge_summaries(*chunks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or update mergeable rating distribution summaries")
+    parser.add_argument('--reviews', default='./CSV/df_reviews.csv')
+    parser.add_argument('--merge', default=None, help="Existing summary CSV to merge the new reviews into")
+    parser.add_argument('--out', default='./CSV/rating_distributions.csv')
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    args = parser.parse_args()
+
+    rating_cols = ['overall_rating', 'work_life_balance', 'culture_values', 'career_opp', 'comp_benefits', 'senior_mgmt']
+    summary = summarise_ratings_csv(args.reviews, rating_cols, args.chunksize)
+    if args.merge and os.path.exists(args.merge):
+        summary = merge_summaries(pd.read_csv(args.merge), summary)
+    summary.to_csv(args.out, index=False)
+
+if __name__ == '__main__':
+    main()
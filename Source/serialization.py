@@ -0,0 +1,26 @@
+#Callback response settings for the dashboard
+#Figures are sent as plotly serializes them: plotly 6 already base64-encodes numpy arrays in trace data,
+#so no extra typed-array pass is applied. Gzip (DASH_COMPRESS=1) is what shrinks responses on the wire.
+import importlib.util
+import os
+
+import plotly.io as pio
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+def compression_enabled():
+    #Gzip responses only when asked for (DASH_COMPRESS=1) and flask-compress is installed
+    if not env_flag('DASH_COMPRESS'):
+        return False
+    if importlib.util.find_spec('flask_compress') is None:
+        print("DASH_COMPRESS is set but flask-compress is not installed; serving uncompressed responses")
+        return False
+    return True
+
+def configure_json_engine():
+    #Callback JSON engine ('json', 'orjson' or 'auto'); plotly's own default is kept unless DASHBOARD_JSON_ENGINE is set
+    engine = os.environ.get('DASHBOARD_JSON_ENGINE')
+    if engine:
+        pio.json.config.default_engine = engine
+    return pio.json.config.default_engine
@@ -0,0 +1,174 @@
+#Lexical topic tagging: an alternative to SentenceTransformer embeddings + KMeans for refreshing topic_trends.csv
+#Topic keyword groups are the existing topic_trends.csv column names ("salary, pay, bonus, compensation, wage").
+#All keywords are compiled into one multi-pattern matcher (Aho-Corasick when pyahocorasick is installed,
+#otherwise a single compiled regex) so every review is tagged in one pass.
+#Run from the Source directory: python topic_tagger.py [--validate ./CSV/topic_labels.csv]
+import argparse
+import re
+import time
+
+import nltk
+nltk.data.path.append("C:/Users/tasni/nltk_data")
+from nltk.stem import WordNetLemmatizer
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+
+from profiling import RunProfiler
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+lemmatizer = WordNetLemmatizer()  #Same lemmatizer proc_dataset.py applies to the review text
+
+def read_topics(path):
+    #Topic labels are the keyword groups in the topic_trends.csv header
+    return [col for col in pd.read_csv(path, nrows=0).columns if col != 'year_month']
+
+def keyword_variants(keyword):
+    #Keyword as written and as lemmatized ("hours" -> "hour", "benefits" -> "benefit"); multi-word
+    #keywords also match written as one word ("work life" -> "worklife", "work-life" normalises to "work life")
+    words = re.sub(r'[^a-z]+', ' ', keyword.lower()).split()
+    lemmas = [lemmatizer.lemmatize(word) for word in words]
+    variants = {' '.join(words), ' '.join(lemmas)}
+    if len(words) > 1:
+        variants |= {''.join(words), ''.join(lemmas)}
+    return variants
+
+def normalise(text):
+    return ' ' + re.sub(r'[^a-z]+', ' ', str(text).lower()).strip() + ' '
+
+class TopicMatcher:
+    def __init__(self, topics):
+        self.topics = topics
+        self.keyword_topics = {}
+        for t, label in enumerate(topics):
+            for keyword in label.split(','):
+                for variant in keyword_variants(keyword):
+                    self.keyword_topics.setdefault(variant, set()).add(t)
+
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, topic_ids in self.keyword_topics.items():
+                #Spaces either side give whole-word matches on normalised text
+                self.automaton.add_word(f' {keyword} ', tuple(topic_ids))
+            self.automaton.make_automaton()
+        else:
+            self.automaton = None
+            alternation = '|'.join(re.escape(k) for k in sorted(self.keyword_topics, key=len, reverse=True))
+            self.pattern = re.compile(rf'\b(?:{alternation})\b')
+
+    def match(self, text):
+        #Topic ids of every keyword hit in a normalised text (one id per hit)
+        if self.automaton is not None:
+            return [t for _, topic_ids in self.automaton.iter(text) for t in topic_ids]
+        return [t for keyword in self.pattern.findall(text) for t in self.keyword_topics[keyword]]
+
+    def tag(self, texts):
+        #Hit counts per review (rows) and topic (columns)
+        rows, cols = [], []
+        for i, text in enumerate(texts):
+            for t in self.match(normalise(text)):
+                rows.append(i)
+                cols.append(t)
+        hits = np.zeros((len(texts), len(self.topics)), dtype=np.int32)
+        np.add.at(hits, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1)
+        return hits
+
+def feedback_text(df):
+    #Same text the clustering cell uses: top pros + top cons text
+    return (df['top_pros_text'].fillna('') + " " + df['top_cons_text'].fillna('')).str.strip()
+
+def topic_trends(year_month, hits, topics):
+    #Reviews mentioning each topic per month, in the topic_trends.csv layout
+    df_hits = pd.DataFrame(hits > 0, columns=topics)
+    df_hits['year_month'] = year_month.values
+    trends = df_hits.groupby('year_month')[topics].sum().astype(float)
+    return trends[sorted(topics)]
+
+def top_topic(hits, topics):
+    #Single label per review (most keyword hits) for comparison with the one-cluster-per-review labels
+    labels = np.array(topics, dtype=object)[hits.argmax(axis=1)]
+    labels[hits.sum(axis=1) == 0] = None
+    return labels
+
+def validation_report(cluster_labels, lexical_labels):
+    #Cluster labels are TF-IDF keywords of each KMeans cluster, not the topic_trends.csv groups, so they are
+    #compared through a cluster x lexical topic contingency table: each cluster is mapped to its majority
+    #lexical topic and agreement is the share of tagged reviews that land on their cluster's majority topic.
+    #Several clusters can map to the same topic, so agreement never falls below the most common topic's share
+    #(the chance baseline); ARI and NMI give chance-corrected views of the same table.
+    cluster_labels = pd.Series(cluster_labels, name='Cluster')
+    lexical_labels = pd.Series(lexical_labels, name='Lexical Topic')
+    tagged = lexical_labels.notna()
+    crosstab = pd.crosstab(cluster_labels[tagged], lexical_labels[tagged])
+
+    tagged_reviews = crosstab.sum(axis=1)
+    df_report = pd.DataFrame({
+        'Cluster': crosstab.index,
+        'Reviews': cluster_labels.value_counts().reindex(crosstab.index).values,
+        'Tagged Reviews': tagged_reviews.values,
+        'Majority Topic': crosstab.idxmax(axis=1).values,
+        'Majority %': (100 * crosstab.max(axis=1) / tagged_reviews).round(2).values,
+    })
+    df_report['Coverage %'] = (100 * df_report['Tagged Reviews'] / df_report['Reviews']).round(2)
+
+    print(crosstab.to_string())
+    print()
+    print(df_report.to_string(index=False))
+    print(f"Coverage (reviews with any keyword): {100 * tagged.mean():.2f}%")
+    n_tagged = max(tagged.sum(), 1)
+    print(f"Agreement with majority-mapped clusters (tagged reviews): {100 * crosstab.max(axis=1).sum() / n_tagged:.2f}% "
+          f"(chance baseline, most common lexical topic: {100 * crosstab.sum(axis=0).max() / n_tagged:.2f}%; "
+          f"{len(crosstab.index)} clusters map to {df_report['Majority Topic'].nunique()} distinct topics)")
+    if tagged.any():
+        print(f"Adjusted Rand index: {adjusted_rand_score(cluster_labels[tagged], lexical_labels[tagged]):.4f}, "
+              f"NMI: {normalized_mutual_info_score(cluster_labels[tagged], lexical_labels[tagged]):.4f}")
+    return df_report, crosstab
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh topic trends by lexical keyword tagging")
+    parser.add_argument('--reviews', default='./CSV/df_reviews.csv')
+    parser.add_argument('--topics', default='./CSV/topic_trends.csv', help="CSV whose header defines the keyword groups")
+    parser.add_argument('--out', default='./CSV/topic_trends.csv')
+    parser.add_argument('--validate', default=None,
+                        help="CSV with feedback_text and topic_label columns exported from the notebook clustering cell")
+    parser.add_argument('--report', default=None, help="Optional CSV path for the per-cluster validation report")
+    parser.add_argument('--crosstab', default=None, help="Optional CSV path for the cluster x lexical topic table")
+    args = parser.parse_args()
+
+    profiler = RunProfiler('topic_tagger')  #Opt-in: set PIPELINE_PROFILE=1 to write a run manifest
+    topics = read_topics(args.topics)
+    with profiler.stage('compile_matcher'):
+        matcher = TopicMatcher(topics)
+
+    df_reviews = profiler.read_csv(args.reviews, usecols=['year_month', 'top_pros_text', 'top_cons_text'])
+    texts = feedback_text(df_reviews)
+    df_reviews = df_reviews[texts.str.len() > 0]
+    texts = texts[texts.str.len() > 0]
+
+    start = time.perf_counter()
+    with profiler.stage('tag') as stage:
+        hits = matcher.tag(texts.tolist())
+        stage.rows = len(texts)
+    print(f"Tagged {len(texts)} reviews in {time.perf_counter() - start:.2f}s "
+          f"({'aho-corasick' if matcher.automaton is not None else 'regex'} matcher)")
+
+    with profiler.stage('topic_trends') as stage:
+        trends = topic_trends(df_reviews['year_month'], hits, topics)
+        stage.rows = len(trends)
+    profiler.to_csv(trends, args.out)
+
+    if args.validate:
+        df_labels = pd.read_csv(args.validate, usecols=['feedback_text', 'topic_label'])
+        lexical_labels = top_topic(matcher.tag(df_labels['feedback_text'].fillna('').tolist()), topics)
+        df_report, crosstab = validation_report(df_labels['topic_label'].values, lexical_labels)
+        if args.report:
+            df_report.to_csv(args.report, index=False)
+        if args.crosstab:
+            crosstab.to_csv(args.crosstab)
+
+if __name__ == '__main__':
+    main()
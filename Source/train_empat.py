@@ -0,0 +1,260 @@
+#CPU-friendly training pipeline for the EmpAt classifier (replaces the notebook training cells)
+#Run from the Source directory: python train_empat.py --data ./CSV/empat_training_data.csv
+import argparse
+import os
+import random
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from torch.optim import AdamW
+from torch.utils.data import Dataset, DataLoader, Sampler
+from transformers import BertTokenizerFast, BertForSequenceClassification
+from sklearn.metrics import f1_score, precision_score, recall_score
+
+MODEL_NAME = 'bert-base-uncased'
+MODEL_PATH = './saved_empat_model'
+CHECKPOINT_PATH = './checkpoints/empat_checkpoint.pt'
+MAX_LEN = 128
+THRESHOLD = 0.3
+
+#Define categories
+empat_categories = [
+    "Economic Value", "Interest Value", "Social Value", "Development Value", "Application Value", "No Value"
+]
+display_categories = empat_categories[:-1]  #For prediction output
+
+def load_labelled_data(path):
+    #Labelled CSV: a text column plus one 0/1 column per EmpAt category
+    df = pd.read_csv(path)
+    df = df[df['text'].notna()]
+    return df['text'].astype(str).tolist(), df[empat_categories].values.astype(np.float32)
+
+#Dataset class: tokenizes once up front and leaves padding to the collator
+class EmpatDataset(Dataset):
+    def __init__(self, texts, labels, tokenizer, max_len=MAX_LEN):
+        encodings = tokenizer(list(texts), add_special_tokens=True, max_length=max_len, truncation=True)
+        self.input_ids = encodings['input_ids']
+        self.labels = labels
+        self.lengths = [len(ids) for ids in self.input_ids]
+
+    def __len__(self):
+        return len(self.input_ids)
+
+    def __getitem__(self, idx):
+        return self.input_ids[idx], self.labels[idx]
+
+def collate_batch(batch, pad_token_id=0):
+    #Dynamic padding: pad to the longest sequence in the batch, not to MAX_LEN
+    max_len = max(len(ids) for ids, _ in batch)
+    input_ids = torch.full((len(batch), max_len), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(batch), max_len), dtype=torch.long)
+    for i, (ids, _) in enumerate(batch):
+        input_ids[i, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+        attention_mask[i, :len(ids)] = 1
+    labels = torch.tensor(np.stack([label for _, label in batch]), dtype=torch.float32)
+    return {'input_ids': input_ids, 'attention_mask': attention_mask, 'labels': labels}
+
+class LengthGroupedBatchSampler(Sampler):
+    #Shuffles, then sorts by length inside windows of batch_size * group_factor samples so each
+    #batch holds similar lengths (little padding) while batch order stays random.
+    #Deterministic per (seed, epoch) so a run can resume part way through an epoch.
+    def __init__(self, lengths, batch_size, group_factor=50, shuffle=True, seed=42):
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.group_factor = group_factor
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+        self.start_batch = 0
+
+    def set_epoch(self, epoch, start_batch=0):
+        self.epoch = epoch
+        self.start_batch = start_batch
+
+    def _batches(self):
+        rng = random.Random(self.seed + self.epoch)
+        indices = list(range(len(self.lengths)))
+        if self.shuffle:
+            rng.shuffle(indices)
+        window = self.batch_size * self.group_factor
+        batches = []
+        for start in range(0, len(indices), window):
+            group = sorted(indices[start:start + window], key=lambda i: self.lengths[i], reverse=True)
+            batches.extend(group[i:i + self.batch_size] for i in range(0, len(group), self.batch_size))
+        if self.shuffle:
+            rng.shuffle(batches)
+        return batches
+
+    def __iter__(self):
+        return iter(self._batches()[self.start_batch:])
+
+    def __len__(self):
+        return (len(self.lengths) + self.batch_size - 1) // self.batch_size - self.start_batch
+
+def split_indices(n, val_fraction=0.2, seed=42):
+    indices = list(range(n))
+    random.Random(seed).shuffle(indices)
+    val_size = int(n * val_fraction)
+    return indices[val_size:], indices[:val_size]
+
+def make_loader(dataset, indices, batch_size, pad_token_id, num_workers, shuffle, seed):
+    subset = torch.utils.data.Subset(dataset, indices)
+    sampler = LengthGroupedBatchSampler([dataset.lengths[i] for i in indices], batch_size, shuffle=shuffle, seed=seed)
+    loader = DataLoader(
+        subset,
+        batch_sampler=sampler,
+        collate_fn=partial(collate_batch, pad_token_id=pad_token_id),
+        num_workers=num_workers,
+        persistent_workers=num_workers > 0,
+        #Own generator for the per-iterator worker seed, so starting an epoch does not draw from the
+        #global torch RNG (dropout) and a restored RNG state lines up with the interrupted run
+        generator=torch.Generator().manual_seed(seed)
+    )
+    return loader, sampler
+
+def save_checkpoint(path, model, optimizer, epoch, batches_done, global_step, best_val_loss, train_loss=0.0, train_batches=0):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    torch.save({
+        'model': model.state_dict(),
+        'optimizer': optimizer.state_dict(),
+        'epoch': epoch,
+        'batches_done': batches_done,
+        'global_step': global_step,
+        'best_val_loss': best_val_loss,
+        'train_loss': train_loss,  #Running loss sum of the epoch so far, for the epoch summary after a resume
+        'train_batches': train_batches,
+        'torch_rng': torch.get_rng_state(),
+    }, tmp_path)
+    os.replace(tmp_path, path)  #Never leave a half-written checkpoint behind
+
+def load_checkpoint(path, model, optimizer):
+    checkpoint = torch.load(path, map_location='cpu', weights_only=False)
+    model.load_state_dict(checkpoint['model'])
+    optimizer.load_state_dict(checkpoint['optimizer'])
+    torch.set_rng_state(checkpoint['torch_rng'])
+    return checkpoint
+
+def evaluate(model, loader, loss_fn, threshold=THRESHOLD):
+    model.eval()
+    total_loss = 0
+    all_labels, all_preds = [], []
+    with torch.no_grad():
+        for batch in loader:
+            outputs = model(input_ids=batch['input_ids'], attention_mask=batch['attention_mask'])
+            total_loss += loss_fn(outputs.logits, batch['labels']).item()
+            all_preds.append((torch.sigmoid(outputs.logits) > threshold).int().numpy())
+            all_labels.append(batch['labels'].int().numpy())
+    all_preds = np.concatenate(all_preds, axis=0)
+    all_labels = np.concatenate(all_labels, axis=0)
+    return {
+        'loss': total_loss / max(len(loader), 1),
+        'f1': f1_score(all_labels, all_preds, average='micro', zero_division=0),
+        'precision': precision_score(all_labels, all_preds, average='micro', zero_division=0),
+        'recall': recall_score(all_labels, all_preds, average='micro', zero_division=0),
+    }
+
+def train(args):
+    torch.manual_seed(args.seed)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.interop_threads:
+        torch.set_num_interop_threads(args.interop_threads)
+    if args.workers:
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')  #Tokenization happens before workers fork
+
+    tokenizer = BertTokenizerFast.from_pretrained(args.model_name)
+    model = BertForSequenceClassification.from_pretrained(
+        args.model_name, num_labels=len(empat_categories), problem_type="multi_label_classification")
+
+    texts, labels = load_labelled_data(args.data)
+    dataset = EmpatDataset(texts, labels, tokenizer, args.max_len)
+    train_idx, val_idx = split_indices(len(dataset), args.val_fraction, args.seed)
+    train_loader, train_sampler = make_loader(
+        dataset, train_idx, args.batch_size, tokenizer.pad_token_id, args.workers, shuffle=True, seed=args.seed)
+    val_loader, _ = make_loader(
+        dataset, val_idx, args.batch_size, tokenizer.pad_token_id, args.workers, shuffle=False, seed=args.seed)
+
+    #Training setup
+    class_counts = labels.sum(axis=0)
+    class_weights = torch.tensor(1. / (class_counts + 1e-6), dtype=torch.float32)  #Small epsilon avoids division by zero
+    loss_fn = nn.BCEWithLogitsLoss(weight=class_weights)
+    optimizer = AdamW(model.parameters(), lr=args.lr)
+
+    start_epoch, start_batch, global_step, best_val_loss = 0, 0, 0, float('inf')
+    if args.resume and os.path.exists(args.checkpoint):
+        checkpoint = load_checkpoint(args.checkpoint, model, optimizer)
+        start_epoch, start_batch = checkpoint['epoch'], checkpoint['batches_done']
+        global_step, best_val_loss = checkpoint['global_step'], checkpoint['best_val_loss']
+        print(f"Resuming from {args.checkpoint}: epoch {start_epoch + 1}, batch {start_batch}")
+
+    for epoch in range(start_epoch, args.epochs):
+        model.train()
+        train_sampler.set_epoch(epoch, start_batch if epoch == start_epoch else 0)
+        train_loader.generator.manual_seed(args.seed + epoch)
+        batches_done = train_sampler.start_batch
+        epoch_batches = batches_done + len(train_sampler)
+        total_train_loss, n_batches, n_samples, n_tokens = 0, 0, 0, 0
+        if batches_done:
+            total_train_loss, n_batches = checkpoint.get('train_loss', 0.0), checkpoint.get('train_batches', 0)
+        epoch_start = time.perf_counter()
+        optimizer.zero_grad()
+
+        for batch in train_loader:
+            outputs = model(input_ids=batch['input_ids'], attention_mask=batch['attention_mask'])
+            loss = loss_fn(outputs.logits, batch['labels'])
+            (loss / args.accum_steps).backward()  #Gradient accumulation: effective batch = batch_size * accum_steps
+            total_train_loss += loss.item()
+            n_batches += 1
+            batches_done += 1
+            n_samples += batch['input_ids'].size(0)
+            n_tokens += int(batch['attention_mask'].sum())
+
+            if batches_done % args.accum_steps == 0 or batches_done == epoch_batches:
+                optimizer.step()
+                optimizer.zero_grad()
+                global_step += 1
+                if args.save_every and global_step % args.save_every == 0:
+                    save_checkpoint(args.checkpoint, model, optimizer, epoch, batches_done, global_step, best_val_loss,
+                                    total_train_loss, n_batches)
+
+        elapsed = time.perf_counter() - epoch_start
+        metrics = evaluate(model, val_loader, loss_fn)
+        best_val_loss = min(best_val_loss, metrics['loss'])
+        save_checkpoint(args.checkpoint, model, optimizer, epoch + 1, 0, global_step, best_val_loss)
+
+        print(f"Epoch {epoch+1}/{args.epochs} | Training Loss: {total_train_loss / max(n_batches, 1):.4f}, Validation Loss: {metrics['loss']:.4f}")
+        print(f"  F1: {metrics['f1']:.4f}, Precision: {metrics['precision']:.4f}, Recall: {metrics['recall']:.4f}")
+        print(f"  Throughput: {n_samples / elapsed:.1f} samples/sec, {n_tokens / elapsed:.0f} tokens/sec ({elapsed:.1f}s)")
+
+    #Save Model
+    model.save_pretrained(args.output)
+    tokenizer.save_pretrained(args.output)
+    return model, tokenizer
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the EmpAt multi-label classifier on CPU")
+    parser.add_argument('--data', default='./CSV/empat_training_data.csv', help="Labelled CSV (text + category columns)")
+    parser.add_argument('--model-name', default=MODEL_NAME)
+    parser.add_argument('--output', default=MODEL_PATH)
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH)
+    parser.add_argument('--resume', action='store_true', help="Continue from --checkpoint if it exists")
+    parser.add_argument('--save-every', type=int, default=0, help="Also checkpoint every N optimizer steps")
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--accum-steps', type=int, default=1)
+    parser.add_argument('--lr', type=float, default=2e-5)
+    parser.add_argument('--max-len', type=int, default=MAX_LEN)
+    parser.add_argument('--val-fraction', type=float, default=0.2)
+    parser.add_argument('--workers', type=int, default=0, help="DataLoader worker processes")
+    parser.add_argument('--threads', type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    parser.add_argument('--interop-threads', type=int, default=0, help="torch inter-op threads (0 = torch default)")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    train(parse_args())